@@ -2,16 +2,19 @@
 # -*- coding: utf-8 -*-
 
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
 import time
 import os
 import sys
-import threading
-import pytz
-import json
+import io
+import select
+import orjson
 import re
-import pickle
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 from yahooquery import Ticker
 from googletrans import Translator
 
@@ -22,55 +25,131 @@ costs = {
     "BNBUSDT": 0.0
 }
 
+# ====== 时区 ======
+NY_TZ = ZoneInfo("America/New_York")
+CHINA_TZ = ZoneInfo("Asia/Shanghai")
+
 # ====== 美股文件路径 ======
 STOCK_FILE = "stocks.txt"
 
+# ====== Gate.io API URL ======
+GATE_TICKERS_URL = "https://api.gateio.ws/api/v4/spot/tickers"
+GATE_SYMBOLS = {"BTC_USDT", "ETH_USDT", "BNB_USDT"}
+
 # ====== 新闻API URL ======
 NEWS_API_URL = "https://static.mktnews.net/json/flash/en.json"
 
 # ====== 新闻翻译缓存文件 ======
-NEWS_CACHE_FILE = "news_translation_cache.pkl"
+NEWS_CACHE_FILE = "news_translation_cache.json"
+# 缓存最多保留的条目数，超出时淘汰最久未使用的条目
+NEWS_CACHE_MAX_SIZE = 2000
+# 内存中已组装好的新闻条目最多保留的数量
+NEWS_RENDER_CACHE_MAX_SIZE = 200
+
+# ====== 复用的 HTTP 会话（保持连接，避免每次请求重新握手） ======
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# ====== 预编译正则 ======
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# ====== 美股表格及分隔线 ======
+STOCK_HEADER = f"{'Ticker':<8} {'Last Close':<8} {'Price':<8} {'Change':<10}"
+STOCK_HEADER_LINE = f"{STOCK_HEADER}    {STOCK_HEADER}"
+SEPARATOR = "-" * 70
+
+# ====== 清屏控制序列（光标移到左上角并清屏） ======
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
 
 # ====== 控制退出和手动刷新 ======
 stop_flag = False
 manual_refresh_flag = False
 show_more_news = False
+# 获取数据时有错误信息直接输出到终端，需要重绘整屏将其清除
+fetch_error_flag = False
 
 # ====== 辅助函数 ======
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def key_listener():
+def report_fetch_error(msg):
+    """输出获取数据时的错误信息，并标记下一帧需要重绘"""
+    global fetch_error_flag
+    fetch_error_flag = True
+    print(msg)
+
+def enable_windows_ansi():
+    """为 Windows 控制台开启 VT 模式，使清屏的 ANSI 控制序列生效"""
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    mode = ctypes.c_uint32()
+    if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+
+def read_key(timeout):
+    """最多等待 timeout 秒读取一个按键，无输入时返回空字符串"""
+    if os.name == 'nt':
+        import msvcrt
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if msvcrt.kbhit():
+                return msvcrt.getwch()
+            time.sleep(0.05)
+        return ''
+    ready, _, _ = select.select([sys.stdin], [], [], timeout)
+    if ready:
+        # 直接读文件描述符，避免 sys.stdin 的缓冲吞掉后续按键
+        return os.read(sys.stdin.fileno(), 1).decode(errors='ignore')
+    return ''
+
+def handle_key(key):
     global stop_flag, manual_refresh_flag, show_more_news
-    while True:
-        key = sys.stdin.read(1).lower()
-        if key == 'q':
-            stop_flag = True
-            break
-        elif key == 'w':
-            manual_refresh_flag = True
-            show_more_news = True
-            print("\n🔄 正在手动刷新所有数据...")
-            sys.stdout.flush()  # 立即显示提示信息
+    key = key.lower()
+    if key == 'q':
+        stop_flag = True
+    elif key == 'w':
+        manual_refresh_flag = True
+        show_more_news = True
+        print("\n🔄 正在手动刷新所有数据...")
+        sys.stdout.flush()  # 立即显示提示信息
 
 # ====== Gate.io ======
 def fetch_prices_from_gate():
     prices = {}
     try:
-        for symbol in ["BTC_USDT", "ETH_USDT", "BNB_USDT"]:
-            r = requests.get(f"https://api.gateio.ws/api/v4/spot/tickers?currency_pair={symbol}", timeout=5)
-            r.raise_for_status()
-            data = r.json()[0]
-            sym_clean = symbol.replace("_", "")
-            prices[sym_clean] = float(data["last"])
+        # 一次请求获取全部交易对，再筛选需要的币种
+        r = SESSION.get(GATE_TICKERS_URL, timeout=5)
+        r.raise_for_status()
+        for data in orjson.loads(r.content):
+            symbol = data.get("currency_pair")
+            if symbol in GATE_SYMBOLS:
+                prices[symbol.replace("_", "")] = float(data["last"])
     except Exception as e:
-        print(f"❌ Gate API 获取失败：{e}")
+        report_fetch_error(f"❌ Gate API 获取失败：{e}")
     return prices
 
+# ====== 各时段价格字段对应的涨跌幅字段 ======
+PRICE_TO_CHANGE = {
+    "preMarketPrice": "preMarketChangePercent",
+    "regularMarketPrice": "regularMarketChangePercent",
+    "postMarketPrice": "postMarketChangePercent",
+    "overnightMarketPrice": "overnightMarketChangePercent",
+}
+
+# ====== 当前时段数据不可用时的回退顺序 ======
+FALLBACK_ORDER = {
+    # 盘前时段：回退到前一日收盘价或隔夜价格
+    "preMarketPrice": ["overnightMarketPrice", "regularMarketPrice", "postMarketPrice"],
+    # 正常交易时段：回退到盘前价格或前一日收盘价
+    "regularMarketPrice": ["preMarketPrice", "postMarketPrice", "overnightMarketPrice"],
+    # 盘后时段：回退到正常交易价格或盘前价格
+    "postMarketPrice": ["regularMarketPrice", "preMarketPrice", "overnightMarketPrice"],
+    # 隔夜时段：回退到盘后价格或正常交易价格
+    "overnightMarketPrice": ["postMarketPrice", "regularMarketPrice", "preMarketPrice"],
+}
+
 # ====== 判断美东时段并返回对应的 price/change 字段 key ======
 def detect_session():
-    tz = pytz.timezone("America/New_York")
-    now = datetime.now(tz)
+    now = datetime.now(NY_TZ)
     h = now.hour + now.minute / 60
     
     # 根据美东时间判断当前应该使用的价格字段
@@ -78,27 +157,34 @@ def detect_session():
         # 盘前交易时段：04:00-09:30 AM EDT
         phase = "盘前交易"
         active_price_key = "preMarketPrice"
-        active_change_key = "preMarketChangePercent"
     elif 9.5 <= h < 16:
         # 正常交易时段：09:30 AM - 04:00 PM EDT
         phase = "正常交易"
         active_price_key = "regularMarketPrice"
-        active_change_key = "regularMarketChangePercent"
     elif 16 <= h < 20:
         # 盘后交易时段：04:00 PM - 08:00 PM EDT
         phase = "盘后交易"
         active_price_key = "postMarketPrice"
-        active_change_key = "postMarketChangePercent"
     else:
         # 隔夜时段：08:00 PM - 次日 04:00 AM EDT
         phase = "隔夜时段"
         active_price_key = "overnightMarketPrice"
-        active_change_key = "overnightMarketChangePercent"
     
+    active_change_key = PRICE_TO_CHANGE[active_price_key]
     return now.strftime("%Y-%m-%d %H:%M:%S"), phase, active_price_key, active_change_key
 
 # ====== 读取 stocks.txt（支持第二列 1/2 标记） ======
+# 按文件修改时间缓存解析结果，文件未变化时不再重复读取
+_stocks_cache = {"path": None, "mtime": None, "value": ([], {})}
+
 def read_stocks(file_path):
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        return [], {}
+    if _stocks_cache["path"] == file_path and _stocks_cache["mtime"] == mtime:
+        return _stocks_cache["value"]
+
     tickers = []
     marks = {}
     try:
@@ -119,13 +205,14 @@ def read_stocks(file_path):
                     marks[t] = mark
     except FileNotFoundError:
         return [], {}
+    _stocks_cache.update(path=file_path, mtime=mtime, value=(tickers, marks))
     return tickers, marks
 
-# ====== 抓取并构建 DataFrame（优化时段价格获取逻辑） ======
+# ====== 抓取并构建股票行数据（优化时段价格获取逻辑） ======
 def fetch_all_stocks(file_path, active_price_key, active_change_key):
     tickers, marks = read_stocks(file_path)
     if not tickers:
-        return pd.DataFrame()
+        return []
 
     tk = Ticker(tickers, params={"overnightPrice": "true"})
     quotes_all = tk.quotes
@@ -136,14 +223,6 @@ def fetch_all_stocks(file_path, active_price_key, active_change_key):
         if not isinstance(q, dict):
             q = {}
 
-        # 所有可能的价格字段对
-        field_pairs = [
-            ("preMarketPrice", "preMarketChangePercent"),
-            ("regularMarketPrice", "regularMarketChangePercent"),
-            ("postMarketPrice", "postMarketChangePercent"),
-            ("overnightMarketPrice", "overnightMarketChangePercent"),
-        ]
-
         # previous close 用于计算 fallback 的百分比
         prev_close = q.get("regularMarketPrice")
 
@@ -154,38 +233,19 @@ def fetch_all_stocks(file_path, active_price_key, active_change_key):
         # 2) 如果当前时段数据不可用，按时间逻辑回退
         if active_price is None:
             # 根据当前时段智能回退
-            if active_price_key == "preMarketPrice":
-                # 盘前时段：回退到前一日收盘价或隔夜价格
-                fallback_order = ["overnightMarketPrice", "regularMarketPrice", "postMarketPrice"]
-            elif active_price_key == "regularMarketPrice":
-                # 正常交易时段：回退到盘前价格或前一日收盘价
-                fallback_order = ["preMarketPrice", "postMarketPrice", "overnightMarketPrice"]
-            elif active_price_key == "postMarketPrice":
-                # 盘后时段：回退到正常交易价格或盘前价格
-                fallback_order = ["regularMarketPrice", "preMarketPrice", "overnightMarketPrice"]
-            else:
-                # 隔夜时段：回退到盘后价格或正常交易价格
-                fallback_order = ["postMarketPrice", "regularMarketPrice", "preMarketPrice"]
-            
-            for pf in fallback_order:
+            for pf in FALLBACK_ORDER[active_price_key]:
                 p = q.get(pf)
                 if p is not None:
                     active_price = p
-                    # 找到对应的涨跌幅字段
-                    matching_cf = None
-                    for pair in field_pairs:
-                        if pair[0] == pf:
-                            matching_cf = pair[1]
-                            break
-                    if matching_cf:
-                        active_change = q.get(matching_cf)
+                    active_change = q.get(PRICE_TO_CHANGE[pf])
                     break
 
         # 3) 涨跌幅直接从API字段获取，不再手动计算
 
         # 格式化数据，为Last Close添加固定宽度以对齐emoji
         active_price_s = f"{float(active_price):.2f}" if active_price is not None else "N/A"
-        active_change_s = f"{float(active_change):+.2f}%" if active_change is not None else "N/A"
+        # 带符号的涨跌幅末尾预留箭头位，渲染时无需逐行再处理
+        active_change_s = f"{float(active_change):+.2f}% " if active_change is not None else "N/A"
         prev_close_s = f"{float(prev_close):.2f}".rjust(8) if prev_close is not None else "N/A".rjust(8)
 
         prefix = marks.get(t, "")
@@ -202,11 +262,12 @@ def fetch_all_stocks(file_path, active_price_key, active_change_key):
             "Ticker": ticker_display,
             "Priority": priority,
             "Price": active_price_s,
-            "Change": active_change_s
+            "Change": active_change_s,
+            # 数值涨跌幅，仅用于排序（"N/A" 视作 0）
+            "ChangeVal": float(active_change) if active_change is not None else 0.0
         })
 
-    df = pd.DataFrame(rows)
-    return df
+    return rows
 
 # ====== 新闻模块 ======
 def fetch_news_data():
@@ -215,14 +276,14 @@ def fetch_news_data():
         # 添加时间戳参数避免缓存
         timestamp = int(time.time() * 1000)
         url = f"{NEWS_API_URL}?t={timestamp}"
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=10)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except requests.RequestException as e:
-        print(f"❌ 新闻API获取失败: {e}")
+        report_fetch_error(f"❌ 新闻API获取失败: {e}")
         return None
-    except json.JSONDecodeError as e:
-        print(f"❌ 新闻JSON解析失败: {e}")
+    except orjson.JSONDecodeError as e:
+        report_fetch_error(f"❌ 新闻JSON解析失败: {e}")
         return None
 
 def format_news_time(time_str):
@@ -231,8 +292,7 @@ def format_news_time(time_str):
         # 解析ISO格式时间
         dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
         # 转换为东8区时间
-        china_tz = pytz.timezone('Asia/Shanghai')
-        china_time = dt.astimezone(china_tz)
+        china_time = dt.astimezone(CHINA_TZ)
         # 返回格式化的时间字符串和datetime对象
         return china_time.strftime('%m-%d %H:%M'), china_time
     except ValueError:
@@ -240,30 +300,45 @@ def format_news_time(time_str):
 
 def clean_news_content(content):
     """清理新闻内容，移除HTML标签"""
-    # 移除HTML标签
-    content = re.sub(r'<[^>]+>', '', content)
-    # 移除多余的空白字符
-    content = re.sub(r'\s+', ' ', content).strip()
-    return content
+    # 移除HTML标签，再按空白拆分重组以合并多余的空白字符
+    return ' '.join(HTML_TAG_RE.sub('', content).split())
 
 # ====== 新闻翻译缓存管理 ======
+# 进程内共享的翻译缓存，首次使用时从磁盘加载一次，之后的 LRU 顺序保存在内存中
+_translation_cache = None
+# 缓存有新增条目时置为 True，只有这时才需要写回磁盘
+_cache_dirty = False
+# 已组装好的新闻条目 {news_key: {'time', 'importance', 'content'}}，命中时跳过清理和翻译
+_news_render_cache = OrderedDict()
+
 def load_translation_cache():
-    """加载翻译缓存"""
+    """加载翻译缓存（按最近使用顺序排列的 OrderedDict）"""
     try:
         if os.path.exists(NEWS_CACHE_FILE):
             with open(NEWS_CACHE_FILE, 'rb') as f:
-                return pickle.load(f)
+                return OrderedDict(orjson.loads(f.read()))
     except Exception as e:
-        print(f"加载翻译缓存失败: {e}")
-    return {}
+        report_fetch_error(f"加载翻译缓存失败: {e}")
+    return OrderedDict()
+
+def get_translation_cache():
+    """获取共享的翻译缓存"""
+    global _translation_cache
+    if _translation_cache is None:
+        _translation_cache = load_translation_cache()
+    return _translation_cache
 
 def save_translation_cache(cache):
-    """保存翻译缓存"""
+    """保存翻译缓存（先写临时文件再替换，避免写入中断损坏缓存）"""
+    global _cache_dirty
+    tmp_file = NEWS_CACHE_FILE + ".tmp"
     try:
-        with open(NEWS_CACHE_FILE, 'wb') as f:
-            pickle.dump(cache, f)
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(cache))
+        os.replace(tmp_file, NEWS_CACHE_FILE)
+        _cache_dirty = False
     except Exception as e:
-        print(f"保存翻译缓存失败: {e}")
+        report_fetch_error(f"保存翻译缓存失败: {e}")
 
 def get_news_key(item):
     """生成新闻的唯一标识符"""
@@ -271,24 +346,44 @@ def get_news_key(item):
     time_str = item.get('time', '')
     content = item.get('data', {}).get('content', '')
     content_preview = clean_news_content(content)[:50]
-    return f"{time_str}_{hash(content_preview)}"
-
-def translate_news_text_cached(text, translator, cache, news_key):
-    """带缓存的翻译功能"""
-    if news_key in cache:
-        return cache[news_key]
-    
+    # 内置 hash() 每次启动随机化，改用稳定的摘要以便缓存跨进程复用
+    digest = hashlib.blake2b(content_preview.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{time_str}_{digest}"
+
+# 翻译器在首次使用时创建并一直复用，出错后丢弃以便下次重新创建
+_translator = None
+
+def get_translator():
+    """获取共享的翻译器实例"""
+    global _translator
+    if _translator is None:
+        _translator = Translator()
+    return _translator
+
+def translate_news_texts_cached(pending, cache):
+    """批量翻译未缓存的新闻内容，pending 为 {news_key: 原文}，结果写入缓存"""
+    global _cache_dirty, _translator
+    keys = list(pending)
     try:
-        if len(text.strip()) == 0:
-            return text
-        result = translator.translate(text, src='en', dest='zh-cn')
-        translated = result.text
-        cache[news_key] = translated
-        return translated
-    except Exception as e:
-        error_msg = f"翻译失败: {e}"
-        cache[news_key] = error_msg
-        return error_msg
+        translator = get_translator()
+        # googletrans 4.0.0rc1 的 translate 只接受单个字符串；清理后的内容不含换行，
+        # 按行拼接后一次翻译，再按行拆回各条新闻
+        result = translator.translate("\n".join(pending[k] for k in keys), src='en', dest='zh-cn')
+        lines = result.text.split("\n")
+        if len(lines) == len(keys):
+            translated = dict(zip(keys, lines))
+        else:
+            # 译文行数对不上时退回逐条翻译
+            translated = {k: translator.translate(pending[k], src='en', dest='zh-cn').text for k in keys}
+    except Exception:
+        # 翻译失败时不写入缓存，本次显示英文原文，下次刷新重试
+        _translator = None
+        return
+    cache.update(translated)
+    # 超出容量时淘汰最久未使用的条目
+    while len(cache) > NEWS_CACHE_MAX_SIZE:
+        cache.popitem(last=False)
+    _cache_dirty = True
 
 def fetch_latest_news(count=5):
     """获取最新的新闻，默认5条，可指定数量"""
@@ -296,21 +391,29 @@ def fetch_latest_news(count=5):
     if not data or not isinstance(data, list):
         return []
     
-    # 加载翻译缓存
-    cache = load_translation_cache()
-    
-    # 初始化翻译器
-    translator = Translator()
+    # 翻译缓存在遇到未组装过的新闻时才取用
+    cache = None
     
     # 按时间排序，获取最新的指定数量条新闻
     sorted_news = sorted(data, key=lambda x: x.get('time', ''), reverse=True)[:count]
     
-    news_list = []
+    # 第一遍：提取新闻信息，收集未缓存的待翻译内容
+    parsed_news = []
+    pending = {}
     for item in sorted_news:
         try:
             # 生成新闻唯一标识
             news_key = get_news_key(item)
             
+            # 之前已组装过的新闻直接复用
+            if news_key in _news_render_cache:
+                _news_render_cache.move_to_end(news_key)
+                parsed_news.append((news_key, None))
+                continue
+            
+            if cache is None:
+                cache = get_translation_cache()
+            
             # 提取基本信息
             time_str = item.get('time', '')
             formatted_time, _ = format_news_time(time_str)
@@ -326,47 +429,179 @@ def fetch_latest_news(count=5):
             # 重要性标识
             importance_mark = "🔥" if important == 1 else "📰"
             
-            # 使用缓存翻译内容
             if clean_content_text:
                 # 限制原文长度，避免翻译过长内容
                 if len(clean_content_text) > 200:
                     clean_content_text = clean_content_text[:200] + "..."
-                translated_content = translate_news_text_cached(clean_content_text, translator, cache, news_key)
-                # 限制翻译后的长度
-                if len(translated_content) > 100:
-                    translated_content = translated_content[:100] + "..."
-            else:
-                translated_content = "无内容"
+                if news_key in cache:
+                    cache.move_to_end(news_key)
+                else:
+                    pending[news_key] = clean_content_text
             
-            news_list.append({
-                'time': formatted_time,
-                'importance': importance_mark,
-                'content': translated_content
-            })
+            parsed_news.append((news_key, (formatted_time, importance_mark, clean_content_text)))
             
         except Exception as e:
             continue
     
-    # 保存更新后的缓存
-    save_translation_cache(cache)
+    # 所有未缓存内容合并为一次翻译请求，全部命中缓存时无需初始化翻译器
+    if pending:
+        translate_news_texts_cached(pending, cache)
+    
+    # 第二遍：从缓存取译文，组装新闻列表
+    news_list = []
+    for news_key, parsed in parsed_news:
+        if parsed is None:
+            news_list.append(_news_render_cache[news_key])
+            continue
+        
+        formatted_time, importance_mark, clean_content_text = parsed
+        if clean_content_text:
+            translated_content = cache.get(news_key, clean_content_text)
+            # 限制翻译后的长度
+            if len(translated_content) > 100:
+                translated_content = translated_content[:100] + "..."
+        else:
+            translated_content = "无内容"
+        
+        news = {
+            'time': formatted_time,
+            'importance': importance_mark,
+            'content': translated_content
+        }
+        # 未翻译成功的新闻不进入组装缓存，下次刷新重新翻译
+        if not clean_content_text or news_key in cache:
+            _news_render_cache[news_key] = news
+        news_list.append(news)
+    
+    while len(_news_render_cache) > NEWS_RENDER_CACHE_MAX_SIZE:
+        _news_render_cache.popitem(last=False)
+    
+    # 仅在缓存有新增条目时保存（全部命中组装缓存时未加载翻译缓存，不能写回）
+    if _cache_dirty and cache is not None:
+        save_translation_cache(cache)
     
     return news_list
 
+# ====== 界面渲染 ======
+def format_stock_row(row):
+    return f"{row['Ticker']:<8} {row['Last Close']:<8} {row['Price']:<8} {row['Change']:<10}"
+
+def render_screen(prices, stock_rows, news_list, force_refresh):
+    """清屏并绘制虚拟币、美股和新闻三部分"""
+    # 整屏内容先写入缓冲区，最后一次性输出
+    out = io.StringIO()
+    
+    # 如果是手动刷新，显示刷新完成提示
+    if force_refresh:
+        print("✅ 手动刷新完成！显示最新数据", file=out)
+        print(file=out)
+    
+    print("=== 综合行情显示 ===", file=out)
+    # print(f"⏰ 本地时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    # print(f"   美东时间: {ny_time}  - {phase}  (使用: {active_price_key} / {active_change_key})\n")
+    print(file=out)
+
+    # 虚拟币部分
+    print("💰 虚拟币行情（Gate.io）:", file=out)
+    for sym in ["BTCUSDT", "ETHUSDT", "BNBUSDT"]:
+        price = prices.get(sym)
+        if price is None:
+            print(f"{sym}: 获取失败", file=out)
+        else:
+            cost = costs.get(sym, 0.0)
+            if cost != 0:
+                if cost > 0:
+                    # 做多：正常计算
+                    pnl = price - cost
+                    pnl_pct = pnl / cost * 100
+                    position_type = "做多"
+                else:
+                    # 做空：负成本价，价格下跌时盈利
+                    pnl = abs(cost) - price  # 做空盈亏 = 开仓价格 - 当前价格
+                    pnl_pct = pnl / abs(cost) * 100
+                    position_type = "做空"
+                
+                print(f"{sym}: {price:,.2f} | {position_type}成本 {abs(cost):,.2f} | 盈亏 {pnl:+.2f} ({pnl_pct:+.2f}%)", file=out)
+            else:
+                print(f"{sym}: {price:,.2f}", file=out)
+    print(file=out)
+
+    # 美股部分：只显示当前时段 price + change
+    if stock_rows:
+        # 按标记优先、涨跌幅从高到低排序
+        sorted_rows = sorted(stock_rows, key=lambda row: (-row["Priority"], -row["ChangeVal"]))
+
+        print(f"📊 美股行情（当前时段价格 & 涨跌%）:", file=out)
+        
+        # 两列显示：将股票分成两组
+        total_stocks = len(sorted_rows)
+        mid_point = (total_stocks + 1) // 2
+        
+        left_rows = sorted_rows[:mid_point]
+        right_rows = sorted_rows[mid_point:]
+        
+        # 格式化左右两列的字符串
+        left_strings = []
+        right_strings = []
+        
+        # mid_point 向上取整，左列行数总是不少于右列
+        for i in range(len(left_rows)):
+            # 左列
+            left_strings.append(format_stock_row(left_rows[i]))
+            
+            # 右列
+            if i < len(right_rows):
+                right_str = format_stock_row(right_rows[i])
+            else:
+                right_str = ""
+            right_strings.append(right_str)
+        
+        # 打印表头
+        print(STOCK_HEADER_LINE, file=out)
+        print(SEPARATOR, file=out)
+        
+        # 打印数据行
+        for left, right in zip(left_strings, right_strings):
+            if right.strip():
+                print(f"{left}    {right}", file=out)
+            else:
+                print(left, file=out)
+    else:
+        print("📊 未找到美股列表 (请创建 stocks.txt)", file=out)
+
+    print(file=out)
+
+    # 新闻部分
+    if news_list:
+        news_count_display = len(news_list)
+        print(f"📰 最新财经新闻（最近{news_count_display}条）:", file=out)
+        print(SEPARATOR, file=out)
+        for i, news in enumerate(news_list, 1):
+            print(f"{news['time']} {news['importance']} {news['content']}", file=out)
+    else:
+        print("📰 新闻获取失败", file=out)
+
+    print(f"\n(虚拟币每60秒刷新 | 美股每10分钟刷新 | 新闻每5分钟刷新 | 按 Q 退出 | 按 W 手动刷新)", file=out)
+
+    sys.stdout.write(CLEAR_SCREEN + out.getvalue())
+    sys.stdout.flush()
+
 # ====== 主循环 ======
 def main():
-    global stop_flag, manual_refresh_flag, show_more_news
-    threading.Thread(target=key_listener, daemon=True).start()
+    global stop_flag, manual_refresh_flag, show_more_news, fetch_error_flag
     print("按 Q 退出程序，按 W 手动刷新所有数据.\n")
     time.sleep(1)
 
     last_stock_update = 0
     last_news_update = 0
-    stock_df = pd.DataFrame()
+    stock_rows = []
     news_list = []
+    last_render_hash = None
+    # 虚拟币、美股、新闻三类请求互不依赖，放到线程池中并发获取
+    executor = ThreadPoolExecutor(max_workers=3)
 
     while not stop_flag:
         now = time.time()
-        prices = fetch_prices_from_gate()
         ny_time, phase, active_price_key, active_change_key = detect_session()
 
         # 检查是否需要手动刷新
@@ -374,16 +609,27 @@ def main():
         if manual_refresh_flag:
             manual_refresh_flag = False  # 重置标志
 
+        prices_future = executor.submit(fetch_prices_from_gate)
+
         # 每10分钟更新一次美股数据（或第一次或手动刷新）
-        if now - last_stock_update > 300 or stock_df.empty or force_refresh:
-            stock_df = fetch_all_stocks(STOCK_FILE, active_price_key, active_change_key)
-            last_stock_update = now
+        stock_future = None
+        if now - last_stock_update > 300 or not stock_rows or force_refresh:
+            stock_future = executor.submit(fetch_all_stocks, STOCK_FILE, active_price_key, active_change_key)
 
         # 每5分钟更新一次新闻数据（或第一次或手动刷新）
+        news_future = None
         if now - last_news_update > 300 or not news_list or force_refresh:
             # 根据show_more_news标志决定显示数量
             news_count = 10 if show_more_news else 5
-            news_list = fetch_latest_news(news_count)
+            news_future = executor.submit(fetch_latest_news, news_count)
+
+        # 等待本轮发起的请求全部完成
+        prices = prices_future.result()
+        if stock_future is not None:
+            stock_rows = stock_future.result()
+            last_stock_update = now
+        if news_future is not None:
+            news_list = news_future.result()
             last_news_update = now
             
             # 如果是手动刷新触发的，在下一个周期重置为默认显示数量
@@ -391,135 +637,36 @@ def main():
                 # 设置一个标志，在下一个自动刷新周期重置
                 pass
 
-        clear_screen()
-        
-        # 如果是手动刷新，显示刷新完成提示
-        if force_refresh:
-            print("✅ 手动刷新完成！显示最新数据")
-            print()
-        
-        print("=== 综合行情显示 ===")
-        # print(f"⏰ 本地时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        # print(f"   美东时间: {ny_time}  - {phase}  (使用: {active_price_key} / {active_change_key})\n")
-        print()
-
-        # 虚拟币部分
-        print("💰 虚拟币行情（Gate.io）:")
-        for sym in ["BTCUSDT", "ETHUSDT", "BNBUSDT"]:
-            price = prices.get(sym)
-            if price is None:
-                print(f"{sym}: 获取失败")
-            else:
-                cost = costs.get(sym, 0.0)
-                if cost != 0:
-                    if cost > 0:
-                        # 做多：正常计算
-                        pnl = price - cost
-                        pnl_pct = pnl / cost * 100
-                        position_type = "做多"
-                    else:
-                        # 做空：负成本价，价格下跌时盈利
-                        pnl = abs(cost) - price  # 做空盈亏 = 开仓价格 - 当前价格
-                        pnl_pct = pnl / abs(cost) * 100
-                        position_type = "做空"
-                    
-                    print(f"{sym}: {price:,.2f} | {position_type}成本 {abs(cost):,.2f} | 盈亏 {pnl:+.2f} ({pnl_pct:+.2f}%)")
-                else:
-                    print(f"{sym}: {price:,.2f}")
-        print()
-
-        # 美股部分：只显示当前时段 price + change
-        if not stock_df.empty:
-            df_sorted = stock_df.copy()
-
-            # 把 Change 字符串转换为数值用于排序（将 "N/A" 视作 0）
-            def parse_pct(s):
-                try:
-                    return float(str(s).replace("%", "").replace("+", ""))
-                except Exception:
-                    return 0.0
-
-            df_sorted["val"] = df_sorted["Change"].apply(parse_pct)
-            df_sorted = df_sorted.sort_values(by=["Priority", "val"], ascending=[False, False]).drop(columns=["Priority", "val"])
-
-            # add arrow
-            def add_arrow(s):
-                if str(s).startswith("+"):
-                    return s + " "
-                elif str(s).startswith("-"):
-                    return s + " "
-                return s
-
-            df_sorted["Change"] = df_sorted["Change"].apply(add_arrow)
-
-            print(f"📊 美股行情（当前时段价格 & 涨跌%）:")
-            
-            # 两列显示：将股票分成两组
-            total_stocks = len(df_sorted)
-            mid_point = (total_stocks + 1) // 2
-            
-            left_df = df_sorted.iloc[:mid_point].reset_index(drop=True)
-            right_df = df_sorted.iloc[mid_point:].reset_index(drop=True)
-            
-            # 格式化左右两列的字符串
-            left_strings = []
-            right_strings = []
-            
-            for i in range(max(len(left_df), len(right_df))):
-                # 左列
-                if i < len(left_df):
-                    row = left_df.iloc[i]
-                    left_str = f"{row['Ticker']:<8} {row['Last Close']:<8} {row['Price']:<8} {row['Change']:<10}"
-                else:
-                    left_str = " " * 34
-                left_strings.append(left_str)
-                
-                # 右列
-                if i < len(right_df):
-                    row = right_df.iloc[i]
-                    right_str = f"{row['Ticker']:<8} {row['Last Close']:<8} {row['Price']:<8} {row['Change']:<10}"
-                else:
-                    right_str = ""
-                right_strings.append(right_str)
-            
-            # 打印表头
-            header_left = f"{'Ticker':<8} {'Last Close':<8} {'Price':<8} {'Change':<10}"
-            header_right = f"{'Ticker':<8} {'Last Close':<8} {'Price':<8} {'Change':<10}"
-            print(f"{header_left}    {header_right}")
-            print("-" * 70)
-            
-            # 打印数据行
-            for left, right in zip(left_strings, right_strings):
-                if right.strip():
-                    print(f"{left}    {right}")
-                else:
-                    print(left)
-        else:
-            print("📊 未找到美股列表 (请创建 stocks.txt)")
-
-        print()
-
-        # 新闻部分
-        if news_list:
-            news_count_display = len(news_list)
-            print(f"📰 最新财经新闻（最近{news_count_display}条）:")
-            print("-" * 70)
-            for i, news in enumerate(news_list, 1):
-                print(f"{news['time']} {news['importance']} {news['content']}")
-        else:
-            print("📰 新闻获取失败")
-
-        print(f"\n(虚拟币每60秒刷新 | 美股每10分钟刷新 | 新闻每5分钟刷新 | 按 Q 退出 | 按 W 手动刷新)")
-        
-        # 在循环中检查是否需要重置新闻显示数量
-        for i in range(60):
-            if stop_flag:
+        # 本轮获取时输出过错误信息，需要重绘以清除
+        had_fetch_error = fetch_error_flag
+        fetch_error_flag = False
+
+        # 数据与上次显示的完全相同时跳过重绘（手动刷新或出错时除外）
+        render_hash = hash((
+            force_refresh,
+            tuple(sorted(prices.items())),
+            tuple((row["Ticker"], row["Last Close"], row["Price"], row["Change"]) for row in stock_rows),
+            tuple((news["time"], news["importance"], news["content"]) for news in news_list),
+        ))
+        if force_refresh or had_fetch_error or render_hash != last_render_hash:
+            render_screen(prices, stock_rows, news_list, force_refresh)
+            last_render_hash = render_hash
+
+        # 等待60秒，期间轮询按键；按 W 后立即进入下一轮刷新
+        cycle_start = time.time()
+        deadline = cycle_start + 60
+        while not stop_flag and not manual_refresh_flag:
+            remaining = deadline - time.time()
+            if remaining <= 0:
                 break
             # 在自动刷新周期中重置show_more_news标志
-            if i == 30 and show_more_news and not manual_refresh_flag:
+            if show_more_news and time.time() - cycle_start >= 30:
                 show_more_news = False
-            time.sleep(1)
+            key = read_key(min(0.5, remaining))
+            if key:
+                handle_key(key)
 
+    executor.shutdown(wait=False)
     print("\n程序已退出。")
 
 # ====== 启动入口 ======
@@ -529,6 +676,8 @@ if __name__ == '__main__':
         fd = sys.stdin.fileno()
         old_settings = termios.tcgetattr(fd)
         tty.setcbreak(fd)
+    else:
+        enable_windows_ansi()
     try:
         main()
     finally: